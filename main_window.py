@@ -78,6 +78,7 @@ class TrainingWindow(QDialog):
         self.power_data = []
         self.heart_rate_data = []
         self.cadence_data = []  # даже если пока не используешь
+        self.timestamps = []  # Время каждого отсчета (мс с начала эпохи)
         self.time_counter = 0
         self.heart_time_counter = 0
         self.power_time_counter = 0
@@ -182,13 +183,14 @@ class TrainingWindow(QDialog):
             self.heart_time_counter += 1
 
         self.time_counter += 1
+        self.timestamps.append(QDateTime.currentMSecsSinceEpoch())
 
-        # Если данных не пришло — дополняем 0
+        # Если данных не пришло — сохраняем пропуск (None), на графике он рисуется как 0
         if not self.received_power:
-            self.power_data.append(0)
+            self.power_data.append(None)
             self.power_time.append(self.power_time_counter)
         if not self.received_heart_rate:
-            self.heart_rate_data.append(0)
+            self.heart_rate_data.append(None)
             self.heart_time.append(self.heart_time_counter)
 
         # Сбрасываем флаги
@@ -197,15 +199,18 @@ class TrainingWindow(QDialog):
 
         # Обновляем каждый график отдельно
         if self.show_power_checkbox.isChecked():
-            self.power_plot.setData(self.power_time, self.power_data)
+            self.power_plot.setData(self.power_time, self.plot_values(self.power_data))
         else:
             self.power_plot.clear()
 
         if self.show_heart_rate_checkbox.isChecked():
-            self.heart_rate_plot.setData(self.heart_time, self.heart_rate_data)
+            self.heart_rate_plot.setData(self.heart_time, self.plot_values(self.heart_rate_data))
         else:
             self.heart_rate_plot.clear()
 
+    def plot_values(self, data):
+        """Значения для графика: пропуски (None) отображаются как 0."""
+        return [0 if value is None else value for value in data]
     
     def closeEvent(self, event):
         """Сохранение данных при закрытии."""
@@ -213,7 +218,8 @@ class TrainingWindow(QDialog):
         data = {
             "power": self.power_data,
             "cadence": self.cadence_data,
-            "heart_rate": self.heart_rate_data
+            "heart_rate": self.heart_rate_data,
+            "timestamps": self.timestamps
         }
         with open(filename, 'w') as f:
             json.dump(data, f, indent=4)
@@ -0,0 +1,713 @@
+import argparse
+import datetime
+import logging
+import os
+import re
+import struct
+import sys
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import chain, zip_longest
+
+
+logger = logging.getLogger(__name__)
+
+# Размер блока чтения файла тренировки (байты)
+CHUNK_SIZE = 64 * 1024
+
+# Поддерживаемые форматы экспорта
+FORMATS = ("fit", "tcx")
+
+# Шаблон имени файла тренировки, сохраняемого TrainingWindow
+SESSION_FILE_PATTERN = re.compile(r"^training_(\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2})\.json$")
+
+# Начало массива верхнего уровня: "ключ": [
+_ARRAY_START = re.compile(rb'"([^"\\]*)"\s*:\s*\[')
+
+# Сколько байт конца блока переносится в следующий при поиске ключей
+_KEY_OVERLAP = 256
+
+Sample = namedtuple("Sample", ["timestamp", "power", "heart_rate", "cadence"])
+
+
+def _find_arrays(path, chunk_size=CHUNK_SIZE):
+    """Смещения начала массивов в файле тренировки: {ключ: смещение первого элемента}."""
+    offsets = {}
+    with open(path, "rb") as f:
+        tail = b""
+        position = 0  # Смещение начала буфера в файле
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return offsets
+            buffer = tail + chunk
+            for match in _ARRAY_START.finditer(buffer):
+                offsets.setdefault(match.group(1).decode("utf-8"), position + match.end())
+            tail = buffer[-_KEY_OVERLAP:]
+            position += len(buffer) - len(tail)
+
+
+def _parse_number(token):
+    if token == b"null":
+        return None
+    if b"." in token or b"e" in token or b"E" in token:
+        return float(token)
+    return int(token)
+
+
+def _iter_json_array(path, offset, chunk_size=CHUNK_SIZE):
+    """
+    Потоковое чтение числового массива, начинающегося со смещения offset.
+
+    Файл читается блоками по chunk_size байт и разбирается целыми блоками,
+    поэтому в памяти никогда не находится весь массив.
+    """
+    with open(path, "rb") as f:
+        f.seek(offset)
+        tail = b""
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                raise ValueError(f"Файл {path} обрывается внутри массива")
+            buffer = tail + chunk
+            end = buffer.find(b"]")
+            if end >= 0:
+                tokens = buffer[:end].split(b",")
+            else:
+                tokens = buffer.split(b",")
+                tail = tokens.pop()  # Число может продолжаться в следующем блоке
+
+            for token in tokens:
+                token = token.strip()
+                if token:
+                    yield _parse_number(token)
+
+            if end >= 0:
+                return
+
+
+def _session_start(path):
+    """Время начала тренировки из имени файла (Unix-время) или None."""
+    match = SESSION_FILE_PATTERN.match(os.path.basename(path))
+    if not match:
+        return None
+    start = datetime.datetime.strptime(match.group(1), "%Y-%m-%d_%H-%M-%S")
+    return start.timestamp()
+
+
+def iter_samples(path, chunk_size=CHUNK_SIZE):
+    """
+    Потоковое чтение отсчетов тренировки в том виде, как они сохранены.
+
+    Каждый массив читается своим генератором со своего смещения, поэтому
+    память не зависит от длины тренировки. Пропуски датчика хранятся как null.
+    Для старых файлов без поля "timestamps" отсчеты равномерно распределяются
+    между временем из имени файла и временем изменения файла (сохранение
+    в конце тренировки), а нули (которыми тогда заполнялись пропуски)
+    считаются отсутствием данных.
+    """
+    offsets = _find_arrays(path, chunk_size)
+
+    def column(key):
+        if key not in offsets:
+            return iter(())
+        return _iter_json_array(path, offsets[key], chunk_size)
+
+    rows = zip_longest(column("power"), column("heart_rate"), column("cadence"))
+
+    if "timestamps" in offsets:
+        timestamps = column("timestamps")
+        for power, heart_rate, cadence in rows:
+            timestamp_ms = next(timestamps, None)
+            if timestamp_ms is None:
+                raise ValueError(f"В тренировке {path} отметок времени меньше, чем отсчетов")
+            yield Sample(timestamp_ms / 1000, power, heart_rate, cadence)
+        if next(timestamps, None) is not None:
+            logger.warning(f"[⚠️] В тренировке {path} отметок времени больше, чем отсчетов")
+        return
+
+    # Число строк нужно заранее, чтобы растянуть их на всю длительность тренировки
+    count = max(sum(1 for _ in column(key)) for key in ("power", "heart_rate", "cadence"))
+    end = os.path.getmtime(path)
+    start = _session_start(path)
+    if start is None or start >= end:
+        # Длительность неизвестна — считаем по строке в секунду, заканчивая временем сохранения
+        start = end - max(count - 1, 0)
+    step = (end - start) / max(count - 1, 1)
+
+    for index, row in enumerate(rows):
+        power, heart_rate, cadence = (value or None for value in row)
+        yield Sample(start + index * step, power, heart_rate, cadence)
+
+
+class _SecondRecord:
+    """Накопитель строк одной секунды: средние мощность и каденс, последний пульс."""
+    def __init__(self, second):
+        self.second = second
+        self.power_total = 0
+        self.power_count = 0
+        self.cadence_total = 0
+        self.cadence_count = 0
+        self.heart_rate = None
+
+    def add(self, sample):
+        if sample.power is not None:
+            self.power_total += sample.power
+            self.power_count += 1
+        if sample.cadence is not None:
+            self.cadence_total += sample.cadence
+            self.cadence_count += 1
+        if sample.heart_rate is not None:
+            self.heart_rate = sample.heart_rate
+
+    def sample(self):
+        return Sample(
+            self.second,
+            self.power_total / self.power_count if self.power_count else None,
+            self.heart_rate,
+            self.cadence_total / self.cadence_count if self.cadence_count else None,
+        )
+
+
+def iter_seconds(path, chunk_size=CHUNK_SIZE):
+    """
+    Потоковое чтение тренировки с частотой 1 Гц.
+
+    Приложение сохраняет строку на каждое событие датчика, то есть
+    несколько строк в секунду; форматы экспорта ожидают не больше одной
+    записи на секунду, поэтому строки одной секунды сводятся в одну.
+    Время в файле — системное и может отступить назад (например, при
+    синхронизации часов); такие строки добавляются к текущей записи,
+    чтобы время записей только возрастало.
+    """
+    record = None
+    for sample in iter_samples(path, chunk_size):
+        second = int(sample.timestamp)
+        if record is None or second > record.second:
+            if record is not None:
+                yield record.sample()
+            record = _SecondRecord(second)
+        record.add(sample)
+    if record is not None:
+        yield record.sample()
+
+
+class SessionSummary:
+    """Итоговые показатели тренировки, накапливаемые за один проход."""
+    def __init__(self):
+        self.count = 0
+        self.start = None
+        self.end = None
+        self.totals = {"power": 0, "heart_rate": 0, "cadence": 0}
+        self.counts = {"power": 0, "heart_rate": 0, "cadence": 0}
+        self.maximums = {"power": None, "heart_rate": None, "cadence": None}
+
+    def add(self, sample):
+        if self.start is None:
+            self.start = sample.timestamp
+        self.end = sample.timestamp
+        self.count += 1
+
+        for field in self.totals:
+            value = getattr(sample, field)
+            if value is None:
+                continue
+            self.totals[field] += value
+            self.counts[field] += 1
+            if self.maximums[field] is None or value > self.maximums[field]:
+                self.maximums[field] = value
+
+    def average(self, field):
+        if not self.counts[field]:
+            return None
+        return round(self.totals[field] / self.counts[field])
+
+    def maximum(self, field):
+        value = self.maximums[field]
+        return None if value is None else round(value)
+
+    @property
+    def elapsed(self):
+        """Длительность тренировки в секундах."""
+        if self.start is None:
+            return 0.0
+        return max(self.end - self.start, 0)
+
+
+def summarize(path, chunk_size=CHUNK_SIZE):
+    """Потоковый подсчет итоговых показателей тренировки (по записям 1 Гц)."""
+    summary = SessionSummary()
+    for sample in iter_seconds(path, chunk_size):
+        summary.add(sample)
+    return summary
+
+
+# ======= FIT =======
+
+# Начало эпохи FIT (1989-12-31 00:00:00 UTC) в Unix-времени
+FIT_EPOCH_OFFSET = 631065600
+FIT_PROTOCOL_VERSION = 0x20
+FIT_PROFILE_VERSION = 2132
+
+# Базовые типы FIT: (код типа, формат struct, недопустимое значение)
+FIT_ENUM = (0x00, "B", 0xFF)
+FIT_UINT8 = (0x02, "B", 0xFF)
+FIT_UINT16 = (0x84, "H", 0xFFFF)
+FIT_UINT32 = (0x86, "I", 0xFFFFFFFF)
+FIT_UINT32Z = (0x8C, "I", 0x00000000)
+
+FIT_HEADER_SIZE = 14
+
+_FIT_CRC_NIBBLE_TABLE = (
+    0x0000, 0xCC01, 0xD801, 0x1400, 0xF001, 0x3C00, 0x2800, 0xE401,
+    0xA001, 0x6C00, 0x7800, 0xB401, 0x5000, 0x9C01, 0x8801, 0x4400,
+)
+
+
+def _fit_crc_byte(crc, byte):
+    """Шаг CRC по полубайтовой таблице из описания протокола FIT."""
+    for nibble in (byte & 0xF, (byte >> 4) & 0xF):
+        tmp = _FIT_CRC_NIBBLE_TABLE[crc & 0xF]
+        crc = (crc >> 4) & 0x0FFF
+        crc = crc ^ tmp ^ _FIT_CRC_NIBBLE_TABLE[nibble]
+    return crc
+
+
+# Побайтовая таблица, построенная из полубайтовой: один поиск на байт вместо четырех
+_FIT_CRC_TABLE = tuple(_fit_crc_byte(0, byte) for byte in range(256))
+
+
+def fit_crc(data, crc=0):
+    """Контрольная сумма CRC-16 в варианте протокола FIT."""
+    table = _FIT_CRC_TABLE
+    for byte in data:
+        crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
+    return crc
+
+
+class FitMessage:
+    """
+    Заранее вычисленное описание сообщения FIT.
+
+    Сообщение-определение и struct для сообщений с данными строятся один
+    раз при импорте модуля и затем переиспользуются для каждой записи.
+    """
+    def __init__(self, local_type, global_number, fields):
+        self.local_type = local_type
+        self.field_names = [name for name, _, _ in fields]
+        self.invalid = {name: base_type[2] for name, _, base_type in fields}
+        self.struct = struct.Struct("<B" + "".join(base_type[1] for _, _, base_type in fields))
+
+        definition = struct.pack("<BBBHB", 0x40 | local_type, 0, 0, global_number, len(fields))
+        for _, number, base_type in fields:
+            definition += struct.pack("<BBB", number, struct.calcsize(base_type[1]), base_type[0])
+        self.definition = definition
+
+    @property
+    def size(self):
+        return self.struct.size
+
+    def pack(self, **values):
+        """Упаковка сообщения с данными; None заменяется недопустимым значением."""
+        packed = []
+        for name in self.field_names:
+            value = values.get(name)
+            packed.append(self.invalid[name] if value is None else value)
+        return self.struct.pack(self.local_type, *packed)
+
+
+FIT_FILE_ID = FitMessage(0, 0, [
+    ("type", 0, FIT_ENUM),
+    ("manufacturer", 1, FIT_UINT16),
+    ("product", 2, FIT_UINT16),
+    ("serial_number", 3, FIT_UINT32Z),
+    ("time_created", 4, FIT_UINT32),
+])
+
+FIT_EVENT = FitMessage(1, 21, [
+    ("timestamp", 253, FIT_UINT32),
+    ("event", 0, FIT_ENUM),
+    ("event_type", 1, FIT_ENUM),
+])
+
+FIT_RECORD = FitMessage(2, 20, [
+    ("timestamp", 253, FIT_UINT32),
+    ("heart_rate", 3, FIT_UINT8),
+    ("cadence", 4, FIT_UINT8),
+    ("power", 7, FIT_UINT16),
+])
+
+FIT_LAP = FitMessage(3, 19, [
+    ("timestamp", 253, FIT_UINT32),
+    ("event", 0, FIT_ENUM),
+    ("event_type", 1, FIT_ENUM),
+    ("start_time", 2, FIT_UINT32),
+    ("total_elapsed_time", 7, FIT_UINT32),
+    ("total_timer_time", 8, FIT_UINT32),
+    ("avg_heart_rate", 15, FIT_UINT8),
+    ("max_heart_rate", 16, FIT_UINT8),
+    ("avg_cadence", 17, FIT_UINT8),
+    ("max_cadence", 18, FIT_UINT8),
+    ("avg_power", 19, FIT_UINT16),
+    ("max_power", 20, FIT_UINT16),
+])
+
+FIT_SESSION = FitMessage(4, 18, [
+    ("timestamp", 253, FIT_UINT32),
+    ("event", 0, FIT_ENUM),
+    ("event_type", 1, FIT_ENUM),
+    ("start_time", 2, FIT_UINT32),
+    ("sport", 5, FIT_ENUM),
+    ("sub_sport", 6, FIT_ENUM),
+    ("total_elapsed_time", 7, FIT_UINT32),
+    ("total_timer_time", 8, FIT_UINT32),
+    ("avg_heart_rate", 16, FIT_UINT8),
+    ("max_heart_rate", 17, FIT_UINT8),
+    ("avg_cadence", 18, FIT_UINT8),
+    ("max_cadence", 19, FIT_UINT8),
+    ("avg_power", 20, FIT_UINT16),
+    ("max_power", 21, FIT_UINT16),
+    ("first_lap_index", 25, FIT_UINT16),
+    ("num_laps", 26, FIT_UINT16),
+])
+
+FIT_ACTIVITY = FitMessage(5, 34, [
+    ("timestamp", 253, FIT_UINT32),
+    ("total_timer_time", 0, FIT_UINT32),
+    ("num_sessions", 1, FIT_UINT16),
+    ("type", 2, FIT_ENUM),
+    ("event", 3, FIT_ENUM),
+    ("event_type", 4, FIT_ENUM),
+])
+
+FIT_MESSAGES = (FIT_FILE_ID, FIT_EVENT, FIT_RECORD, FIT_LAP, FIT_SESSION, FIT_ACTIVITY)
+
+# Значения перечислений профиля FIT
+FIT_FILE_ACTIVITY = 4
+FIT_MANUFACTURER_DEVELOPMENT = 255
+FIT_EVENT_TIMER = 0
+FIT_EVENT_SESSION = 8
+FIT_EVENT_LAP = 9
+FIT_EVENT_ACTIVITY = 26
+FIT_EVENT_TYPE_START = 0
+FIT_EVENT_TYPE_STOP = 1
+FIT_EVENT_TYPE_STOP_ALL = 4
+FIT_SPORT_CYCLING = 2
+FIT_SUB_SPORT_INDOOR_CYCLING = 6
+
+
+def _fit_time(timestamp):
+    return int(timestamp) - FIT_EPOCH_OFFSET
+
+
+def _fit_uint8(value):
+    return None if value is None else max(0, min(round(value), 0xFE))
+
+
+def _fit_uint16(value):
+    return None if value is None else max(0, min(round(value), 0xFFFE))
+
+
+def _open_output(output_path, mode, **kwargs):
+    """Открытие файла результата; каталог создается только перед первой записью."""
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    return open(output_path, mode, **kwargs)
+
+
+def _fit_header(data_size):
+    header = struct.pack("<BBHI4s", FIT_HEADER_SIZE, FIT_PROTOCOL_VERSION, FIT_PROFILE_VERSION, data_size, b".FIT")
+    return header + struct.pack("<H", fit_crc(header))
+
+
+def write_fit(path, output_path, chunk_size=CHUNK_SIZE):
+    """
+    Потоковый экспорт тренировки в формат Garmin FIT за один проход.
+
+    Заголовок пишется с нулевым размером данных, итоги копятся по ходу
+    записи, затем размер и CRC заголовка исправляются, а CRC файла
+    считается повторным чтением результата блоками.
+    Возвращает SessionSummary, чтобы другие форматы не читали файл заново.
+    """
+    samples = iter_seconds(path, chunk_size)
+    first = next(samples, None)
+    if first is None:
+        raise ValueError(f"В тренировке {path} нет данных")
+
+    if first.timestamp < FIT_EPOCH_OFFSET:
+        # Записи идут по возрастанию времени, так что достаточно проверить первую
+        raise ValueError(f"Время тренировки {path} раньше начала эпохи FIT (1989-12-31)")
+
+    start = _fit_time(first.timestamp)
+    summary = SessionSummary()
+
+    with _open_output(output_path, "w+b") as f:
+        f.write(_fit_header(0))
+        for message in FIT_MESSAGES:
+            f.write(message.definition)
+
+        f.write(FIT_FILE_ID.pack(
+            type=FIT_FILE_ACTIVITY, manufacturer=FIT_MANUFACTURER_DEVELOPMENT,
+            product=0, serial_number=1, time_created=start,
+        ))
+        f.write(FIT_EVENT.pack(timestamp=start, event=FIT_EVENT_TIMER, event_type=FIT_EVENT_TYPE_START))
+
+        for sample in chain([first], samples):
+            summary.add(sample)
+            f.write(FIT_RECORD.pack(
+                timestamp=_fit_time(sample.timestamp),
+                heart_rate=_fit_uint8(sample.heart_rate),
+                cadence=_fit_uint8(sample.cadence),
+                power=_fit_uint16(sample.power),
+            ))
+
+        end = _fit_time(summary.end)
+        elapsed_ms = int(summary.elapsed * 1000)
+        totals = dict(
+            start_time=start,
+            total_elapsed_time=elapsed_ms,
+            total_timer_time=elapsed_ms,
+            avg_heart_rate=_fit_uint8(summary.average("heart_rate")),
+            max_heart_rate=_fit_uint8(summary.maximum("heart_rate")),
+            avg_cadence=_fit_uint8(summary.average("cadence")),
+            max_cadence=_fit_uint8(summary.maximum("cadence")),
+            avg_power=_fit_uint16(summary.average("power")),
+            max_power=_fit_uint16(summary.maximum("power")),
+        )
+
+        f.write(FIT_EVENT.pack(timestamp=end, event=FIT_EVENT_TIMER, event_type=FIT_EVENT_TYPE_STOP_ALL))
+        f.write(FIT_LAP.pack(timestamp=end, event=FIT_EVENT_LAP, event_type=FIT_EVENT_TYPE_STOP, **totals))
+        f.write(FIT_SESSION.pack(
+            timestamp=end, event=FIT_EVENT_SESSION, event_type=FIT_EVENT_TYPE_STOP,
+            sport=FIT_SPORT_CYCLING, sub_sport=FIT_SUB_SPORT_INDOOR_CYCLING,
+            first_lap_index=0, num_laps=1, **totals,
+        ))
+        f.write(FIT_ACTIVITY.pack(
+            timestamp=end, total_timer_time=elapsed_ms, num_sessions=1, type=0,
+            event=FIT_EVENT_ACTIVITY, event_type=FIT_EVENT_TYPE_STOP,
+        ))
+
+        data_size = f.tell() - FIT_HEADER_SIZE
+        f.seek(0)
+        f.write(_fit_header(data_size))
+
+        f.seek(0)
+        crc = 0
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            crc = fit_crc(chunk, crc)
+        f.write(struct.pack("<H", crc))
+
+    return summary
+
+
+# ======= TCX =======
+
+TCX_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<TrainingCenterDatabase'
+    ' xmlns="http://www.garmin.com/xmlschemas/TrainingCenterDatabase/v2"'
+    ' xmlns:ns3="http://www.garmin.com/xmlschemas/ActivityExtension/v2">\n'
+    '  <Activities>\n'
+    '    <Activity Sport="Biking">\n'
+)
+TCX_FOOTER = (
+    '        </Track>\n'
+    '      </Lap>\n'
+    '    </Activity>\n'
+    '  </Activities>\n'
+    '</TrainingCenterDatabase>\n'
+)
+
+
+def _tcx_time(timestamp):
+    moment = datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc)
+    return moment.strftime("%Y-%m-%dT%H:%M:%S.") + f"{moment.microsecond // 1000:03d}Z"
+
+
+def _tcx_trackpoint(sample):
+    parts = [f"          <Trackpoint>\n            <Time>{_tcx_time(sample.timestamp)}</Time>\n"]
+    if sample.heart_rate is not None:
+        parts.append(
+            "            <HeartRateBpm><Value>"
+            f"{round(sample.heart_rate)}</Value></HeartRateBpm>\n"
+        )
+    if sample.cadence is not None:
+        parts.append(f"            <Cadence>{min(round(sample.cadence), 254)}</Cadence>\n")
+    if sample.power is not None:
+        parts.append(
+            "            <Extensions><ns3:TPX><ns3:Watts>"
+            f"{max(0, round(sample.power))}</ns3:Watts></ns3:TPX></Extensions>\n"
+        )
+    parts.append("          </Trackpoint>\n")
+    return "".join(parts)
+
+
+def write_tcx(path, output_path, summary=None, chunk_size=CHUNK_SIZE):
+    """
+    Потоковый экспорт тренировки в формат TCX.
+
+    Итоги круга в TCX идут до точек трека, поэтому без готового summary
+    они считаются отдельным проходом (summarize), а точки пишутся блоками
+    по мере чтения.
+    """
+    if summary is None:
+        summary = summarize(path, chunk_size)
+    if not summary.count:
+        raise ValueError(f"В тренировке {path} нет данных")
+
+    start = _tcx_time(summary.start)
+    lap = [
+        f"      <Id>{start}</Id>\n",
+        f'      <Lap StartTime="{start}">\n',
+        f"        <TotalTimeSeconds>{summary.elapsed:.3f}</TotalTimeSeconds>\n",
+        "        <DistanceMeters>0</DistanceMeters>\n",
+        "        <Calories>0</Calories>\n",
+    ]
+    if summary.average("heart_rate") is not None:
+        lap.append(f"        <AverageHeartRateBpm><Value>{summary.average('heart_rate')}</Value></AverageHeartRateBpm>\n")
+        lap.append(f"        <MaximumHeartRateBpm><Value>{summary.maximum('heart_rate')}</Value></MaximumHeartRateBpm>\n")
+    lap.append("        <Intensity>Active</Intensity>\n")
+    if summary.average("cadence") is not None:
+        lap.append(f"        <Cadence>{min(summary.average('cadence'), 254)}</Cadence>\n")
+    lap.append("        <TriggerMethod>Manual</TriggerMethod>\n")
+    lap.append("        <Track>\n")
+
+    with _open_output(output_path, "w", encoding="utf-8") as f:
+        f.write(TCX_HEADER)
+        f.write("".join(lap))
+
+        buffer = []
+        buffered = 0
+        for sample in iter_seconds(path, chunk_size):
+            trackpoint = _tcx_trackpoint(sample)
+            buffer.append(trackpoint)
+            buffered += len(trackpoint)
+            if buffered >= chunk_size:
+                f.write("".join(buffer))
+                buffer = []
+                buffered = 0
+        f.write("".join(buffer))
+
+        f.write(TCX_FOOTER)
+
+    return output_path
+
+
+# ======= Пакетный экспорт =======
+
+def export_session(path, output_dir=None, formats=FORMATS, chunk_size=CHUNK_SIZE):
+    """
+    Экспорт одной тренировки во все указанные форматы.
+
+    FIT пишется первым и возвращает итоги тренировки, которые TCX
+    переиспользует вместо отдельного прохода по файлу.
+    Возвращает список путей к созданным файлам.
+    """
+    for fmt in formats:
+        if fmt not in FORMATS:
+            raise ValueError(f"Неизвестный формат экспорта: {fmt}")
+
+    if not SESSION_FILE_PATTERN.match(os.path.basename(path)):
+        logger.warning(f"[⚠️] Имя файла {path} не похоже на файл тренировки training_*.json")
+
+    output_dir = output_dir or os.path.dirname(path) or "."
+    base_name = os.path.splitext(os.path.basename(path))[0]
+
+    summary = None
+    outputs = []
+    output_path = None
+    try:
+        if "fit" in formats:
+            output_path = os.path.join(output_dir, f"{base_name}.fit")
+            summary = write_fit(path, output_path, chunk_size)
+            outputs.append(output_path)
+            logger.info(f"📤 Экспорт {path} -> {output_path}")
+        if "tcx" in formats:
+            output_path = os.path.join(output_dir, f"{base_name}.tcx")
+            write_tcx(path, output_path, summary, chunk_size)
+            outputs.append(output_path)
+            logger.info(f"📤 Экспорт {path} -> {output_path}")
+    except Exception:
+        # Тренировка считается неэкспортированной, поэтому удаляем все ее результаты,
+        # включая файл, запись которого прервалась
+        for created in set(outputs + [output_path]):
+            if created and os.path.exists(created):
+                os.remove(created)
+        raise
+    return outputs
+
+
+def find_sessions(directory):
+    """Список файлов тренировок training_*.json в каталоге."""
+    return sorted(
+        os.path.join(directory, name)
+        for name in os.listdir(directory)
+        if SESSION_FILE_PATTERN.match(name)
+    )
+
+
+def export_directory(directory, output_dir=None, formats=FORMATS, workers=None):
+    """
+    Параллельный экспорт всех тренировок каталога по процессам.
+
+    Ошибка в одной тренировке не прерывает экспорт остальных.
+    Возвращает (пути к созданным файлам, тренировки, которые не удалось экспортировать).
+    """
+    sessions = find_sessions(directory)
+    outputs = []
+    failed = []
+    if not sessions:
+        logger.warning(f"[⚠️] В каталоге {directory} нет тренировок для экспорта")
+        return outputs, failed
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(export_session, path, output_dir, tuple(formats)): path
+            for path in sessions
+        }
+        for future in as_completed(futures):
+            try:
+                outputs.extend(future.result())
+            except Exception as e:
+                logger.error(f"[⚠️] Ошибка экспорта {futures[future]}: {e}")
+                failed.append(futures[future])
+    return sorted(outputs), sorted(failed)
+
+
+def _positive_int(value):
+    number = int(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"ожидается положительное число, получено {value}")
+    return number
+
+
+def main(argv=None):
+    """Точка входа командной строки; возвращает 1, если хотя бы один экспорт не удался."""
+    parser = argparse.ArgumentParser(description="Экспорт тренировок в FIT и TCX")
+    parser.add_argument("paths", nargs="+", help="Файлы training_*.json или каталоги с ними")
+    parser.add_argument("-f", "--format", dest="formats", nargs="+", choices=FORMATS, default=list(FORMATS))
+    parser.add_argument("-o", "--output-dir", help="Каталог для результатов (по умолчанию рядом с исходным файлом)")
+    parser.add_argument("-j", "--workers", type=_positive_int, help="Число процессов для пакетного экспорта")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(filename)s - %(levelname)s - %(message)s")
+
+    failed = 0
+    for path in args.paths:
+        if os.path.isdir(path):
+            _, errors = export_directory(path, args.output_dir, args.formats, args.workers)
+            failed += len(errors)
+        else:
+            try:
+                export_session(path, args.output_dir, args.formats)
+            except Exception as e:
+                logger.error(f"[⚠️] Ошибка экспорта {path}: {e}")
+                failed += 1
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())